@@ -1,54 +1,372 @@
-import pandas as pd
-import time
 import argparse
+import json
+import os
+import sys
+import time
+from importlib.util import find_spec
+from itertools import product
+from typing import Any, Dict, List, Tuple
+
+DEFAULT_AREA = '52.229,20.944,52.410,21.222'
+DEFAULT_POI_TYPES = (
+    'bar,cafe,fast_food,food_court,ice_cream,pub,restaurant,'
+    'college,library,research_institute,school,university,'
+    'parking,atm,bank,clinic,doctors,pharmacy,veterinary,'
+    'casino,cinema,events_venue,nightclub,theatre,police'
+)
+
+
+def parse_area(value) -> Tuple[float, float, float, float]:
+    """
+    Parses a bounding box given as a comma-separated string or a list of numbers.
+
+    Returns:
+        Tuple in the format (min_lat, min_lon, max_lat, max_lon).
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    area = tuple(float(v) for v in value)
+    if len(area) != 4:
+        raise ValueError("Area must be specified as min_lat,min_lon,max_lat,max_lon")
+    return area
+
+
+def parse_poi_types(value) -> Tuple[str, ...]:
+    """
+    Parses POI types given as a comma-separated string or a list of names.
+    Surrounding whitespace is stripped, empty entries and duplicates are dropped.
+
+    Returns:
+        Sorted tuple of POI types.
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(sorted({t.strip() for t in value if t.strip()}))
+
+
+def _as_list(value) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def load_jobs(path: str) -> List[Dict[str, Any]]:
+    """
+    Loads a batch job spec from a JSON file and expands it into single jobs.
+
+    The spec is an object with a "jobs" list (or the list itself). Each entry has
+    an "area", "poi_types" and optional "name". "radius" and "min_prevalence" may
+    be single values or lists, in which case every combination becomes a job.
+
+    Returns:
+        List of jobs with keys: name, area, poi_types, radius, min_prevalence.
+
+    Raises:
+        ValueError: If the spec is malformed, naming the offending entry.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    if isinstance(spec, dict):
+        if 'jobs' not in spec:
+            raise ValueError('spec must contain a "jobs" list')
+        spec = spec['jobs']
+    if not isinstance(spec, list):
+        raise ValueError('spec must be a list of jobs or an object with a "jobs" list')
+
+    jobs = []
+    for i, entry in enumerate(spec):
+        try:
+            area = parse_area(entry['area'])
+            poi_types = parse_poi_types(entry['poi_types'])
+            radii = _as_list(entry.get('radius', 0.005))
+            prevalences = _as_list(entry.get('min_prevalence', 0.5))
+            if not radii or not prevalences:
+                raise ValueError("radius and min_prevalence lists must not be empty")
+            for radius, min_prevalence in product(radii, prevalences):
+                jobs.append({
+                    'name': entry.get('name', f'job{i}'),
+                    'area': area,
+                    'poi_types': poi_types,
+                    'radius': float(radius),
+                    'min_prevalence': float(min_prevalence),
+                })
+        except KeyError as e:
+            raise ValueError(f"job entry {i}: missing key {e}") from e
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"job entry {i}: {e}") from e
+    return jobs
+
+
+def order_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Orders jobs so that jobs sharing a dataset, and within it a radius, run
+    back to back. The sort is stable, so the spec order is kept otherwise.
+
+    Returns:
+        List of jobs grouped by (area, poi_types, radius).
+    """
+    return sorted(jobs, key=lambda job: (job['area'], job['poi_types'], job['radius']))
+
+
+def warm_up() -> float:
+    """
+    Imports the heavy dependencies used by the jobs, so their cost is not
+    attributed to the first job.
+
+    Returns:
+        Time spent importing, in seconds.
+    """
+    start_time = time.perf_counter()
+    import overpy  # noqa: F401
+    import pandas  # noqa: F401
+    import scipy.spatial  # noqa: F401
+
+    import src.colocation_dataset  # noqa: F401
+    import src.colocation_miner  # noqa: F401
+    return time.perf_counter() - start_time
+
+
+class JobRunner:
+    def __init__(self):
+        """
+        Runs colocation mining jobs in a single process. Only the most recently
+        used dataset and neighbor graph are kept in memory: the dataset is reused
+        by consecutive jobs with the same area and POI types, and the neighbor
+        graph by consecutive jobs that also share the radius. Use order_jobs to
+        group jobs so that both are reused as much as possible.
+        """
+        self._dataset_key = None
+        self._dataset = None
+        self._neighbor_graph_key = None
+        self._neighbor_graph = None
+
+    def _load_data(self, area, poi_types):
+        key = (area, poi_types)
+        if key != self._dataset_key:
+            from src.colocation_dataset import OSMColocationDataset
+
+            # release the previous dataset and its graph before downloading the next one
+            self._dataset_key = self._dataset = None
+            self._set_neighbor_graph(None, None)
+            print(f"Loading data for {len(poi_types)} POI types in area {area}")
+            data = OSMColocationDataset(area, list(poi_types)).load_data()
+            print(f"Loaded {len(data)} points")
+            if not data.empty:
+                counts = data['type'].value_counts()
+                for poi_type in poi_types:
+                    print(f"  - {poi_type}: {counts.get(poi_type, 0)} instances")
+            self._dataset_key = key
+            self._dataset = data
+        return self._dataset
+
+    def _get_neighbor_graph(self, key):
+        return self._neighbor_graph if key == self._neighbor_graph_key else None
 
-from src.colocation_dataset import OSMColocationDataset
-from src.colocation_miner import ColocationMiner
+    def _set_neighbor_graph(self, key, graph):
+        self._neighbor_graph_key = key
+        self._neighbor_graph = graph
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a single job. Exceptions raised while loading or mining are caught
+        and recorded, so a single failed job does not abort the batch.
+
+        Returns:
+            Dictionary with the job parameters, timings in seconds, the list of
+            discovered patterns and an error message (None on success).
+        """
+        job_start = time.perf_counter()
+        load_time = mine_time = 0.0
+        patterns = []
+        error = None
+
+        try:
+            from src.colocation_miner import ColocationMiner
+
+            data = self._load_data(job['area'], job['poi_types'])
+            load_time = time.perf_counter() - job_start
+
+            graph_key = (job['area'], job['poi_types'], job['radius'])
+            mine_start = time.perf_counter()
+            if not data.empty:
+                miner = ColocationMiner(radius=job['radius'], min_prevalence=job['min_prevalence'])
+                # release a stale graph before building a new one
+                neighbors = self._get_neighbor_graph(graph_key)
+                if neighbors is None:
+                    self._set_neighbor_graph(None, None)
+                miner.fit(data, instance_neighbors=neighbors)
+                self._set_neighbor_graph(graph_key, miner.instance_neighbors)
+                patterns = [p.to_dict() for p in miner.get_patterns()]
+            mine_time = time.perf_counter() - mine_start
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            patterns = []
+
+        return {
+            **job,
+            'load_seconds': load_time,
+            'mine_seconds': mine_time,
+            'latency_seconds': time.perf_counter() - job_start,
+            'error': error,
+            'patterns': patterns,
+        }
+
+
+_JOB_COLUMNS = ['name', 'area', 'poi_types', 'radius', 'min_prevalence']
+
+
+def _job_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the job parameters of a result with tuples converted to lists, as
+    shared by both Parquet outputs.
+    """
+    fields = {c: result[c] for c in _JOB_COLUMNS}
+    fields['area'] = list(fields['area'])
+    fields['poi_types'] = list(fields['poi_types'])
+    return fields
+
+
+def _jobs_path(output: str) -> str:
+    """
+    Returns the path of the per-job timings file written next to a Parquet output.
+    """
+    stem, _ = os.path.splitext(output)
+    return f"{stem}.jobs.parquet"
+
+
+def write_results(results: List[Dict[str, Any]], timings: Dict[str, float], output: str, fmt: str) -> None:
+    """
+    Writes job results to a JSON or Parquet file.
+
+    JSON output holds the batch timings and one entry per job with its patterns.
+    Parquet output holds one row per pattern, tagged with the job parameters, and
+    a sibling "<stem>.jobs.parquet" file with per-job timings and errors.
+
+    Args:
+        results: Results returned by JobRunner.run.
+        timings: Batch-level timings, e.g. startup_seconds and import_seconds.
+        output: Path of the output file.
+        fmt: Output format, "json" or "parquet".
+    """
+    if fmt == 'json':
+        with open(output, 'w') as f:
+            json.dump({**timings, 'jobs': results}, f, indent=2)
+        return
+
+    import pandas as pd
+
+    rows = []
+    for result in results:
+        job = _job_fields(result)
+        for pattern in result['patterns']:
+            rows.append({**job, **pattern, 'types': list(pattern['types'])})
+
+    patterns_df = pd.DataFrame(rows, columns=_JOB_COLUMNS + ['types', 'participation_index', 'num_instances'])
+    patterns_df.to_parquet(output, index=False)
+
+    jobs_df = pd.DataFrame([
+        {
+            **_job_fields(result),
+            'num_patterns': len(result['patterns']),
+            'load_seconds': result['load_seconds'],
+            'mine_seconds': result['mine_seconds'],
+            'latency_seconds': result['latency_seconds'],
+            **timings,
+            'error': result['error'],
+        }
+        for result in results
+    ])
+    jobs_df.to_parquet(_jobs_path(output), index=False)
 
 
 def main():
+    main_start = time.perf_counter()
     parser = argparse.ArgumentParser(description='Run colocation pattern mining on OSM data')
     parser.add_argument('--radius', type=float, default=0.005, help='Neighborhood radius')
     parser.add_argument('--min-prevalence', type=float, default=0.5, help='Minimum participation index')
-    parser.add_argument('--area', type=str, default='52.229,20.944,52.410,21.222', 
+    parser.add_argument('--area', type=str, default=DEFAULT_AREA,
                         help='Bounding box in format "min_lat,min_lon,max_lat,max_lon"')
-    parser.add_argument('--poi-types', type=str, 
-                        default='bar,cafe,fast_food,food_court,pub,restaurant',
+    parser.add_argument('--poi-types', type=str, default=DEFAULT_POI_TYPES,
                         help='Comma-separated list of POI types')
+    parser.add_argument('--jobs', type=str, default=None,
+                        help='JSON batch job spec; overrides the single-job options above')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write results to this file (.json or .parquet)')
+    parser.add_argument('--format', type=str, choices=['json', 'parquet'], default=None,
+                        help='Output format, inferred from the --output extension by default')
     args = parser.parse_args()
 
-    # Parse area
-    area = tuple(map(float, args.area.split(',')))
-    assert len(area) == 4, "Area must be specified as min_lat,min_lon,max_lat,max_lon"
-    
-    # Parse POI types
-    # poi_types = args.poi_types.split(',')
-    poi_types = ["bar", "cafe", "fast_food", "food_court", "ice_cream", "pub", 'restaurant', "college", "library", "research_institute", "school", "university", "parking", "atm", 'bank', "clinic", "doctors", "pharmacy", "veterinary", "casino", "cinema", "events_venue", "nightclub", "theatre", "	police"]
-    
-    print(f"Loading data for {len(poi_types)} POI types in area {area}")
-    dataset = OSMColocationDataset(area, poi_types)
-    data = dataset.load_data()
-    
-    print(f"Loaded {len(data)} points")
-    for poi_type in poi_types:
-        count = len(data[data['type'] == poi_type])
-        print(f"  - {poi_type}: {count} instances")
-    
-    start_time = time.time()
-    miner = ColocationMiner(radius=args.radius, min_prevalence=args.min_prevalence)
-    miner.fit(data)
-    total_time = time.time() - start_time
-    
-    patterns = miner.get_patterns()
-    patterns_df = pd.DataFrame([p.to_dict() for p in patterns])
-    
-    print(f"\nMining completed in {total_time:.2f} seconds")
-    print(f"Found {len(patterns)} patterns")
-    
-    if len(patterns) > 0:
+    fmt = args.format
+    if fmt is not None and not args.output:
+        parser.error("--format requires --output")
+    if args.output:
+        ext = os.path.splitext(args.output)[1].lower()
+        inferred = {'.json': 'json', '.parquet': 'parquet'}.get(ext)
+        if fmt is None:
+            fmt = inferred or 'json'
+        elif inferred is not None and inferred != fmt:
+            parser.error(f"--output extension '{ext}' does not match --format {fmt}")
+    if fmt == 'parquet' and not (find_spec('pyarrow') or find_spec('fastparquet')):
+        parser.error("Parquet output requires pyarrow or fastparquet to be installed")
+
+    if args.jobs:
+        try:
+            jobs = load_jobs(args.jobs)
+        except (OSError, ValueError) as e:
+            parser.error(f"{args.jobs}: {e}")
+    else:
+        try:
+            area = parse_area(args.area)
+        except ValueError as e:
+            parser.error(str(e))
+        jobs = [{
+            'name': 'cli',
+            'area': area,
+            'poi_types': parse_poi_types(args.poi_types),
+            'radius': args.radius,
+            'min_prevalence': args.min_prevalence,
+        }]
+
+    jobs = order_jobs(jobs)
+
+    try:
+        import_time = warm_up()
+    except ImportError as e:
+        sys.exit(f"Missing dependency: {e.name or e}")
+    timings = {
+        'startup_seconds': time.perf_counter() - main_start,
+        'import_seconds': import_time,
+    }
+    print(f"Startup completed in {timings['startup_seconds']:.3f} seconds "
+          f"(imports {import_time:.3f}), running {len(jobs)} job(s)")
+
+    runner = JobRunner()
+    results = []
+    for job in jobs:
+        print(f"\n[{job['name']}] radius={job['radius']}, min_prevalence={job['min_prevalence']}")
+        result = runner.run(job)
+        results.append(result)
+        if result['error'] is not None:
+            print(f"[{job['name']}] Failed after {result['latency_seconds']:.2f} seconds: {result['error']}")
+            continue
+        print(f"[{job['name']}] Found {len(result['patterns'])} patterns, "
+              f"latency {result['latency_seconds']:.2f} seconds "
+              f"(load {result['load_seconds']:.2f}, mining {result['mine_seconds']:.2f})")
+
+    failed = sum(result['error'] is not None for result in results)
+    if failed:
+        print(f"\n{failed} of {len(results)} job(s) failed")
+
+    if args.output:
+        write_results(results, timings, args.output, fmt)
+        print(f"\nResults written to {args.output}")
+    elif len(results) == 1 and results[0]['patterns']:
+        import pandas as pd
+
         print("\nTop patterns:")
         pd.set_option('display.max_colwidth', None)
-        print(patterns_df.head(10))
+        print(pd.DataFrame(results[0]['patterns']).head(10))
+
+    if failed:
+        sys.exit(1 if failed == len(results) else 2)
 
 if __name__ == "__main__":
     main()
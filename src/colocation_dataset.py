@@ -1,11 +1,12 @@
-import requests
+from __future__ import annotations
+
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any
 
-import overpy
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ColocationDataset(ABC):
@@ -62,6 +63,9 @@ class OSMColocationDataset(ColocationDataset):
             - x: X coordinate
             - y: Y coordinate
         """
+        import overpy
+        import pandas as pd
+
         api = overpy.Overpass()
 
         query = f"""
@@ -120,6 +124,8 @@ class GBIFColocationDataset(ColocationDataset):
             - x: X coordinate
             - y: Y coordinate
         """
+        import pandas as pd
+
         data = []
         
         for species_name in self._species_names:
@@ -159,6 +165,8 @@ class GBIFColocationDataset(ColocationDataset):
         Returns:
             GBIF taxon key for the species, or None if not found.
         """
+        import requests
+
         url = "https://api.gbif.org/v1/species/match"
         params = {"name": species_name, "strict": "false"}
         
@@ -186,6 +194,8 @@ class GBIFColocationDataset(ColocationDataset):
         Returns:
             List of occurrence records with keys: id, type, x, y, year, month, day.
         """
+        import requests
+
         min_lat, min_lon, max_lat, max_lon = self._area
         
         base_params = {
@@ -1,13 +1,16 @@
-import pandas as pd
+from __future__ import annotations
+
 from collections import defaultdict
 from itertools import combinations
-from scipy.spatial import KDTree
 import time
-from typing import Dict, List, Set, Tuple, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Optional, Any
 
 from src.colocation_pattern import ColocationPattern
 from src.types import InstanceId, FeatureType, TypeInstancePair, Pattern, PatternInstance
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ColocationMiner:
     def __init__(self, radius: float = 0.005, min_prevalence: float = 0.3):
@@ -28,12 +31,19 @@ class ColocationMiner:
         self.unique_types: List[FeatureType] = []
         self.instances_by_type: Dict[FeatureType, pd.DataFrame] = {}
 
-    def fit(self, df: pd.DataFrame) -> None:
+    def fit(
+        self,
+        df: pd.DataFrame,
+        instance_neighbors: Optional[Dict[TypeInstancePair, Set[TypeInstancePair]]] = None,
+    ) -> None:
         """
         Main method to find colocation patterns in spatial data.
         
         Args:
             df: DataFrame containing spatial features with columns: 'type', 'x', 'y'
+            instance_neighbors: Neighbor graph from a previous fit on the same data
+                and radius. When given, spatial indexing and neighbor
+                precomputation are skipped and the graph is reused as is.
         """
         start_time = time.time()
         
@@ -45,13 +55,17 @@ class ColocationMiner:
         }
         print(f"Data preparation completed in {time.time() - start_time:.2f} seconds")
 
-        start_time = time.time()
-        self._build_spatial_indices()
-        print(f"Spatial indices built in {time.time() - start_time:.2f} seconds")
+        if instance_neighbors is not None:
+            self.instance_neighbors = instance_neighbors
+            print("Reusing precomputed neighbor graph")
+        else:
+            start_time = time.time()
+            self._build_spatial_indices()
+            print(f"Spatial indices built in {time.time() - start_time:.2f} seconds")
 
-        start_time = time.time()
-        self._precompute_all_neighbors()
-        print(f"Neighbor precomputation completed in {time.time() - start_time:.2f} seconds")
+            start_time = time.time()
+            self._precompute_all_neighbors()
+            print(f"Neighbor precomputation completed in {time.time() - start_time:.2f} seconds")
         
         start_time = time.time()
         size_2_patterns = self._discover_size_2_patterns()
@@ -79,6 +93,8 @@ class ColocationMiner:
 
     def _build_spatial_indices(self) -> None:
         """Build KDTree indices for each type."""
+        from scipy.spatial import KDTree
+
         for t, instances in self.instances_by_type.items():
             points = instances[['x', 'y']].values
             self.spatial_indices[t] = {
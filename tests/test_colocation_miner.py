@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.colocation_miner import ColocationMiner
+
+
+def make_data(seed: int = 0, n_per_type: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for t in ["a", "b", "c", "d"]:
+        points = rng.uniform(0, 1, size=(n_per_type, 2))
+        frames.append(pd.DataFrame({"type": t, "x": points[:, 0], "y": points[:, 1]}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def pattern_summary(miner: ColocationMiner):
+    return [(p.types, p.pi, sorted(p.instances)) for p in miner.get_patterns()]
+
+
+def test_fit_finds_colocated_pair():
+    data = pd.DataFrame({
+        "type": ["a", "b", "a", "b", "c"],
+        "x": [0.0, 0.0, 1.0, 1.0, 5.0],
+        "y": [0.0, 0.001, 1.0, 1.001, 5.0],
+    })
+    miner = ColocationMiner(radius=0.01, min_prevalence=0.5)
+    miner.fit(data)
+
+    patterns = miner.get_patterns()
+    assert [p.types for p in patterns] == [("a", "b")]
+    assert patterns[0].pi == 1.0
+    assert len(patterns[0].instances) == 2
+
+
+@pytest.mark.parametrize("radius", [0.05, 0.1])
+def test_fit_with_reused_neighbor_graph_matches_fresh_fit(radius):
+    data = make_data()
+    base = ColocationMiner(radius=radius, min_prevalence=0.1)
+    base.fit(data)
+
+    for min_prevalence in [0.1, 0.3, 0.5]:
+        fresh = ColocationMiner(radius=radius, min_prevalence=min_prevalence)
+        fresh.fit(data)
+        reused = ColocationMiner(radius=radius, min_prevalence=min_prevalence)
+        reused.fit(data, instance_neighbors=base.instance_neighbors)
+
+        assert pattern_summary(reused) == pattern_summary(fresh)
+        assert reused.instance_neighbors is base.instance_neighbors
+
+
+def test_fit_with_reused_neighbor_graph_skips_precomputation(monkeypatch):
+    data = make_data()
+    base = ColocationMiner(radius=0.1, min_prevalence=0.3)
+    base.fit(data)
+
+    def fail(self):
+        raise AssertionError("neighbors should not be recomputed")
+
+    monkeypatch.setattr(ColocationMiner, "_build_spatial_indices", fail)
+    monkeypatch.setattr(ColocationMiner, "_precompute_all_neighbors", fail)
+    ColocationMiner(radius=0.1, min_prevalence=0.5).fit(data, instance_neighbors=base.instance_neighbors)
@@ -0,0 +1,200 @@
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from src.colocation_dataset import OSMColocationDataset
+from src.colocation_miner import ColocationMiner
+
+AREA = [52.2, 20.9, 52.4, 21.2]
+
+
+def make_data(seed: int = 0, n_per_type: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for t in ["bar", "cafe", "pub"]:
+        points = rng.uniform(0, 1, size=(n_per_type, 2))
+        frames.append(pd.DataFrame({"type": t, "x": points[:, 0], "y": points[:, 1]}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_spec(tmp_path, spec) -> str:
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+
+@pytest.fixture
+def counted_runs(monkeypatch):
+    """Replaces the Overpass download with synthetic data and counts downloads and neighbor builds."""
+    calls = {"load": 0, "neighbors": 0}
+
+    def load_data(self):
+        calls["load"] += 1
+        self._data = make_data()
+        return self._data
+
+    precompute = ColocationMiner._precompute_all_neighbors
+
+    def counted_precompute(self):
+        calls["neighbors"] += 1
+        precompute(self)
+
+    monkeypatch.setattr(OSMColocationDataset, "load_data", load_data)
+    monkeypatch.setattr(ColocationMiner, "_precompute_all_neighbors", counted_precompute)
+    return calls
+
+
+def test_parse_poi_types_strips_and_deduplicates():
+    assert main.parse_poi_types("pub, bar,\tpolice,,bar") == ("bar", "police", "pub")
+    assert main.parse_poi_types(["cafe", " bar "]) == ("bar", "cafe")
+
+
+def test_load_jobs_expands_radius_and_prevalence(tmp_path):
+    path = write_spec(tmp_path, {"jobs": [
+        {"name": "food", "area": AREA, "poi_types": ["pub", "bar"],
+         "radius": [0.002, 0.005], "min_prevalence": [0.3, 0.5]},
+        {"area": AREA, "poi_types": "cafe", "radius": 0.01},
+    ]})
+
+    jobs = main.load_jobs(path)
+
+    assert [(j["name"], j["radius"], j["min_prevalence"]) for j in jobs] == [
+        ("food", 0.002, 0.3), ("food", 0.002, 0.5),
+        ("food", 0.005, 0.3), ("food", 0.005, 0.5),
+        ("job1", 0.01, 0.5),
+    ]
+    assert jobs[0]["area"] == tuple(AREA)
+    assert jobs[0]["poi_types"] == ("bar", "pub")
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"area": [1, 2, 3], "poi_types": ["bar"]}, "job entry 1: Area must be specified"),
+    ({"poi_types": ["bar"]}, "job entry 1: missing key 'area'"),
+    ({"area": AREA}, "job entry 1: missing key 'poi_types'"),
+    ({"area": AREA, "poi_types": ["bar"], "radius": []}, "job entry 1: radius and min_prevalence"),
+    ({"area": AREA, "poi_types": ["bar"], "min_prevalence": []}, "job entry 1: radius and min_prevalence"),
+    ({"area": AREA, "poi_types": ["bar"], "radius": "wide"}, "job entry 1: could not convert"),
+])
+def test_load_jobs_reports_malformed_entry(tmp_path, entry, message):
+    path = write_spec(tmp_path, [{"area": AREA, "poi_types": ["bar"]}, entry])
+    with pytest.raises(ValueError, match=message):
+        main.load_jobs(path)
+
+
+def test_load_jobs_requires_jobs_list(tmp_path):
+    with pytest.raises(ValueError, match='"jobs" list'):
+        main.load_jobs(write_spec(tmp_path, {"tasks": []}))
+
+
+def test_order_jobs_groups_by_dataset_and_radius():
+    other_area = tuple(AREA[:3] + [21.3])
+    jobs = [
+        {"name": "a", "area": tuple(AREA), "poi_types": ("bar",), "radius": 0.01},
+        {"name": "b", "area": other_area, "poi_types": ("bar",), "radius": 0.005},
+        {"name": "c", "area": tuple(AREA), "poi_types": ("bar",), "radius": 0.005},
+        {"name": "d", "area": tuple(AREA), "poi_types": ("bar",), "radius": 0.01},
+    ]
+    assert [j["name"] for j in main.order_jobs(jobs)] == ["c", "a", "d", "b"]
+
+
+def test_job_runner_reuses_dataset_and_neighbor_graph(tmp_path, counted_runs):
+    path = write_spec(tmp_path, [
+        {"area": AREA, "poi_types": ["bar", "cafe", "pub"],
+         "radius": [0.05, 0.1], "min_prevalence": [0.1, 0.3, 0.5]},
+    ])
+    runner = main.JobRunner()
+    results = [runner.run(job) for job in main.order_jobs(main.load_jobs(path))]
+
+    assert all(r["error"] is None for r in results)
+    assert counted_runs == {"load": 1, "neighbors": 2}
+
+    for result in results:
+        fresh = ColocationMiner(radius=result["radius"], min_prevalence=result["min_prevalence"])
+        fresh.fit(make_data())
+        assert result["patterns"] == [p.to_dict() for p in fresh.get_patterns()]
+
+
+def test_job_runner_records_failed_job(monkeypatch):
+    def load_data(self):
+        raise TimeoutError("Overpass timed out")
+
+    monkeypatch.setattr(OSMColocationDataset, "load_data", load_data)
+    job = {"name": "j", "area": tuple(AREA), "poi_types": ("bar",), "radius": 0.01, "min_prevalence": 0.5}
+
+    result = main.JobRunner().run(job)
+
+    assert result["error"] == "TimeoutError: Overpass timed out"
+    assert result["patterns"] == []
+    assert result["latency_seconds"] >= 0
+
+
+def run_results(counted_runs):
+    runner = main.JobRunner()
+    jobs = [
+        {"name": "j", "area": tuple(AREA), "poi_types": ("bar", "cafe", "pub"),
+         "radius": 0.1, "min_prevalence": p}
+        for p in [0.1, 0.9]
+    ]
+    return [runner.run(job) for job in jobs]
+
+
+def test_write_results_json(tmp_path, counted_runs):
+    results = run_results(counted_runs)
+    output = tmp_path / "results.json"
+
+    main.write_results(results, {"startup_seconds": 0.5, "import_seconds": 0.4}, str(output), "json")
+
+    written = json.loads(output.read_text())
+    assert written["startup_seconds"] == 0.5
+    assert written["import_seconds"] == 0.4
+    assert len(written["jobs"]) == 2
+    job = written["jobs"][0]
+    assert job["area"] == AREA
+    assert job["error"] is None
+    assert set(job["patterns"][0]) == {"types", "participation_index", "num_instances"}
+
+
+def test_write_results_parquet(tmp_path, counted_runs):
+    pytest.importorskip("pyarrow")
+    results = run_results(counted_runs)
+    output = tmp_path / "results.parquet"
+
+    main.write_results(results, {"startup_seconds": 0.5, "import_seconds": 0.4}, str(output), "parquet")
+
+    patterns = pd.read_parquet(output)
+    jobs = pd.read_parquet(tmp_path / "results.jobs.parquet")
+    job_columns = ["name", "area", "poi_types", "radius", "min_prevalence"]
+    assert list(patterns.columns) == job_columns + ["types", "participation_index", "num_instances"]
+    assert list(jobs.columns[:len(job_columns)]) == job_columns
+    assert len(patterns) == sum(len(r["patterns"]) for r in results)
+    assert jobs["num_patterns"].tolist() == [len(r["patterns"]) for r in results]
+    assert jobs["error"].isna().all()
+    assert (jobs["startup_seconds"] == 0.5).all()
+
+
+@pytest.mark.parametrize("fail_on, exit_code", [({"bar", "pub"}, 1), ({"pub"}, 2)])
+def test_main_exit_code_on_failed_jobs(tmp_path, monkeypatch, fail_on, exit_code):
+    def load_data(self):
+        if set(self._poi_types) & fail_on:
+            raise TimeoutError("Overpass timed out")
+        self._data = make_data()
+        return self._data
+
+    path = write_spec(tmp_path, [
+        {"area": AREA, "poi_types": ["bar"]},
+        {"area": AREA, "poi_types": ["pub"]},
+    ])
+    output = tmp_path / "results.json"
+    monkeypatch.setattr(OSMColocationDataset, "load_data", load_data)
+    monkeypatch.setattr(main, "warm_up", lambda: 0.0)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--jobs", path, "--output", str(output)])
+
+    with pytest.raises(SystemExit) as exc:
+        main.main()
+
+    assert exc.value.code == exit_code
+    assert len(json.loads(output.read_text())["jobs"]) == 2